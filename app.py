@@ -1,59 +1,241 @@
+import argparse
+import queue
+import threading
+import time
 import cv2
 import mediapipe as mp
-from gestures import get_gesture, list_gestures
+import numpy as np
+from gestures import BaseGesture, HandFeatures, SystemVolume, VolumeGesture, get_gesture, list_gestures, osascript
+
+# requested capture format
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+
+# frame width for the whole-frame hand search, close to MediaPipe's internal ~256x256 input,
+# the height follows the camera's aspect ratio
+INFERENCE_WIDTH = 320
+
+# padding around the last hand bounding box, as a fraction of its size
+ROI_MARGIN = 0.25
+
+# pending gesture actions, more than this are dropped so held gestures cannot pile up
+ACTION_QUEUE_SIZE = 4
+
+# run hand detection on every Nth frame, gestures update at CAMERA_FPS / N
+INFER_EVERY = 2
+
+# after this many detections in a row without a hand, drop to IDLE_INFER_EVERY
+IDLE_AFTER_MISSES = 10
+IDLE_INFER_EVERY = 5
+
+# status overlay
+STATUS_FONT = cv2.FONT_HERSHEY_SIMPLEX
+STATUS_SCALE = 0.7
+STATUS_THICKNESS = 2
+STATUS_ORIGIN = (10, 30)
+DURATION_ORIGIN = (10, 60)
+STATUS_READY_COLOR = (0, 255, 0) # Green - ready to execute
+STATUS_WAITING_COLOR = (0, 255, 255) # Yellow - waiting
+STATUS_IDLE_COLOR = (100, 100, 100)
 
 class AirCommandController:
-    def __init__(self):
+    def __init__(self, show_preview=True):
+        # preview window with landmarks and status, off for headless runs
+        self.show_preview = show_preview
+        
         # Initialize MediaPipe
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
+        # single user app, tracking one hand halves the work of the default two
+        # video mode carries the hand box over between calls, so it is only ever fed
+        # crops around the last hand (the hand sits at about the same place in each
+        # crop, so the carried-over box stays valid)
         self.hands = self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=1,
             model_complexity=0,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
         
+        # whole-frame search while no hand is tracked, static mode keeps no state so
+        # switching between it and the crops never reuses a box from the wrong framing
+        self._hand_search = self.mp_hands.Hands(
+            static_image_mode=True,
+            max_num_hands=1,
+            model_complexity=0,
+            min_detection_confidence=0.7
+        )
+        
+        # gesture actions (osascript calls) run on a worker so they never block the capture loop
+        self._action_queue = queue.Queue(maxsize=ACTION_QUEUE_SIZE)
+        
+        # volume is read once and then tracked locally, shared by the volume gestures
+        # the first read runs on the action worker so a slow osascript cannot stall startup
+        self._volume_cache = SystemVolume()
+        self._action_queue.put_nowait((self._volume_cache.get, ()))
+        
         # Initialize gestures
         self.gestures = {}
         for gesture_name in list_gestures():
-            self.gestures[gesture_name] = get_gesture(gesture_name)
+            gesture = get_gesture(gesture_name)
+            gesture.action_queue = self._action_queue
+            if isinstance(gesture, VolumeGesture):
+                gesture.system_volume = self._volume_cache
+            self.gestures[gesture_name] = gesture
+        
+        # finger-state pattern of every gesture in one array so matching is a single compare
+        patterned = [name for name, g in self.gestures.items() if g.pattern is not None]
+        self._gesture_names = patterned
+        self._gesture_patterns = np.array([self.gestures[name].pattern for name in patterned], dtype=np.uint8)
+        self._unpatterned_gestures = [name for name in self.gestures if name not in patterned]
         
         # Initialize camera
         self.cap = cv2.VideoCapture(0)
         if not self.cap.isOpened():
             raise Exception("Camera could not be opened")
         
+        # keep only the newest frame in the driver queue so reads are never stale
+        if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("Warning: camera backend ignored CAP_PROP_BUFFERSIZE, frames may lag")
+        
+        # MediaPipe works at ~256x256 internally, larger captures are wasted bandwidth
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        self.cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+        
         # Current active gesture
         self.current_gesture = None
         
+        # reused every frame for the search resize and color conversion, allocated from
+        # the first frame because cameras may ignore the requested capture size
+        self._small = None
+        self._rgb = None
+        self._search_frame_shape = None # frame shape the search buffers were sized for
+        self._roi_buf = None # flat backing store for hand crops, sized to the full frame
+        self._flipped = None # mirrored preview frame, allocated once the capture size is known
+        
+        # cached status line, rebuilt by _draw_status when (gesture, ready) changes
+        self._last_status_key = None
+        self._status_text = "No gesture detected"
+        self._status_color = STATUS_IDLE_COLOR
+        
+        # inference frame skipping, see INFER_EVERY and IDLE_INFER_EVERY
+        self._infer_every = INFER_EVERY
+        self._frame_idx = -1 # first frame is always processed
+        self._last_hand = None # landmarks redrawn on skipped frames
+        self._miss_count = 0 # consecutive detections without a hand
+        
+        # hand region (x0, y0, x1, y1) in full-frame pixels, reused on the next frame
+        self._last_bbox = None
+        
+        # capture thread publishes the newest frame into a single slot, run() consumes it
+        self._latest_frame = None
+        self._frame_lock = threading.Lock()
+        self._frame_wanted = threading.Event() # set by run() once it is ready for the next frame
+        self._frame_wanted.set()
+        self._frame_ready = threading.Event() # set when a frame is published to the slot
+        self._stop = threading.Event()
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        self._action_thread = threading.Thread(target=self._action_loop, daemon=True)
+        self._action_thread.start()
+        
+    def _capture_loop(self):
+        """Continuously grab frames, decoding only when run() is ready for one"""
+        while not self._stop.is_set():
+            # grab() only advances the driver queue, decoding is deferred to retrieve()
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            
+            # frames grabbed while the main loop is still busy are dropped undecoded,
+            # the first grab after run() asks for a frame is the one that gets decoded
+            if not self._frame_wanted.is_set():
+                continue
+            
+            success, frame = self.cap.retrieve()
+            if not success:
+                continue
+            with self._frame_lock:
+                self._latest_frame = frame
+                self._frame_wanted.clear()
+                self._frame_ready.set()
+        
+    def _action_loop(self):
+        """Run queued gesture actions one at a time"""
+        while not self._stop.is_set():
+            try:
+                action, args = self._action_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                action(*args)
+            except Exception as e:
+                print(f"Gesture action failed: {e}")
+        
     def run(self):
         """Main application loop"""
         print("AirCommand - Hand Gesture Control")
         print("Available gestures:")
         for name, gesture in self.gestures.items():
             print(f"  {gesture.name}: {gesture.__class__.__doc__ or 'No description'}")
-        print("\nPress 'q' to quit, 'ESC' to exit")
+        if self.show_preview:
+            print("\nPress 'q' to quit, 'ESC' to exit")
+        else:
+            print("\nRunning without preview, press Ctrl+C to quit")
+        
+        try:
+            self._loop()
+        except KeyboardInterrupt:
+            pass
         
+        self.cleanup()
+    
+    def _loop(self):
+        """Capture, detect and display frames until the user quits"""
         while True:
-            success, image = self.cap.read()
-            if not success:
-                print("Ignoring empty camera frame.")
+            # take the frame out of the slot, an empty slot means the previous frame is done
+            with self._frame_lock:
+                image = self._latest_frame
+                self._latest_frame = None
+                self._frame_ready.clear()
+                if image is None:
+                    # ask the capture thread to decode the next frame it grabs
+                    self._frame_wanted.set()
+            if image is None:
+                # sleep until the capture thread publishes, the timeout keeps the loop
+                # responsive if the camera stops delivering frames
+                self._frame_ready.wait(timeout=0.1)
                 continue
 
-            # Process image
-            image.flags.writeable = False
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(image)
+            # Only run inference every few frames, skipped frames redraw the last landmarks
+            self._frame_idx += 1
+            fresh = self._frame_idx % self._infer_every == 0
+            if fresh:
+                hand_landmarks, landmarks = self._detect_hands(image)
+                self._last_hand = hand_landmarks
+                
+                # slow down while nobody is showing a hand, back to full rate once one appears
+                if hand_landmarks is not None:
+                    self._miss_count = 0
+                else:
+                    self._miss_count += 1
+                self._infer_every = IDLE_INFER_EVERY if self._miss_count >= IDLE_AFTER_MISSES else INFER_EVERY
+            else:
+                hand_landmarks = self._last_hand
+            
+            # one clock read per frame, shared by every gesture timing check
+            now = time.monotonic()
 
             # Draw hand annotations and detect gestures
-            image.flags.writeable = True
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
             
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw landmarks
+            if hand_landmarks is not None:
+                # Draw landmarks
+                if self.show_preview:
                     self.mp_drawing.draw_landmarks(
                         image,
                         hand_landmarks,
@@ -61,15 +243,22 @@ class AirCommandController:
                         self.mp_drawing_styles.get_default_hand_landmarks_style(),
                         self.mp_drawing_styles.get_default_hand_connections_style()
                     )
-                    
-                    # Detect and execute gestures
-                    self._process_gestures(hand_landmarks.landmark, image)
+                
+                # Detect and execute gestures, only on new landmarks
+                if fresh:
+                    self._process_gestures(landmarks, image, now)
             
-            # Flip image first, then draw status text
-            image = cv2.flip(image, 1)
+            if not self.show_preview:
+                continue
+            
+            # Flip image first (into a reused buffer), then draw status text
+            if self._flipped is None or self._flipped.shape != image.shape:
+                self._flipped = np.empty_like(image)
+            cv2.flip(image, 1, dst=self._flipped)
+            image = self._flipped
             
             # Display status (now on the flipped image)
-            self._draw_status(image)
+            self._draw_status(image, now)
             
             # Show frame
             cv2.imshow('AirCommand - Hand Gesture Control', image)
@@ -78,16 +267,111 @@ class AirCommandController:
             key = cv2.waitKey(5) & 0xFF
             if key == ord('q') or key == 27:  # 'q' or ESC
                 break
+    
+    def _detect_hands(self, image):
+        """Track the hand in a full-resolution crop of its last region, or search a downscaled frame"""
+        # returns (hand_landmarks, landmarks) where landmarks is the (21, 3) float32 array
+        # in whole-frame coordinates, or (None, None) when no hand was found
+        height, width = image.shape[:2]
         
-        self.cleanup()
+        if self._last_bbox is not None:
+            # crop the full-resolution BGR frame so the hand keeps all its pixels,
+            # converted into a reused buffer so tracking allocates nothing per frame
+            x0, y0, x1, y1 = self._last_bbox
+            roi = self._roi_view(y1 - y0, x1 - x0, image.size)
+            cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2RGB, dst=roi)
+            roi.flags.writeable = False
+            results = self.hands.process(roi)
+            if results.multi_hand_landmarks:
+                hand_landmarks = results.multi_hand_landmarks[0]
+                landmarks = BaseGesture.landmarks_to_array(hand_landmarks.landmark)
+                
+                # landmarks are relative to the crop, map them back to the whole frame
+                self._roi_to_frame(landmarks, self._last_bbox, width, height)
+                if self.show_preview:
+                    # drawing reads the protobuf landmarks, only then are they updated too
+                    self._copy_to_landmarks(landmarks, hand_landmarks.landmark)
+                
+                self._last_bbox = self._hand_bbox(landmarks, width, height)
+                return hand_landmarks, landmarks
+            # hand left the region, search the whole frame again (a second process() call
+            # on this frame, only paid on the frame the hand is lost)
+        
+        # search a downscaled RGB copy, the BGR frame is only used for cropping and drawing
+        if self._search_frame_shape != image.shape:
+            self._allocate_search_buffers(image.shape)
+        small_height, small_width = self._small.shape[:2]
+        cv2.resize(image, (small_width, small_height), dst=self._small, interpolation=cv2.INTER_AREA)
+        self._rgb.flags.writeable = True
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        
+        # read-only input lets MediaPipe use the buffer without copying it
+        self._rgb.flags.writeable = False
+        results = self._hand_search.process(self._rgb)
+        if not results.multi_hand_landmarks:
+            self._last_bbox = None
+            return None, None
+        
+        hand_landmarks = results.multi_hand_landmarks[0]
+        landmarks = BaseGesture.landmarks_to_array(hand_landmarks.landmark)
+        self._last_bbox = self._hand_bbox(landmarks, width, height)
+        return hand_landmarks, landmarks
+    
+    def _allocate_search_buffers(self, frame_shape):
+        """Size the search buffers to INFERENCE_WIDTH wide at the frame's aspect ratio"""
+        height, width = frame_shape[:2]
+        small_height = max(round(INFERENCE_WIDTH * height / width), 1)
+        self._small = np.empty((small_height, INFERENCE_WIDTH, 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._small)
+        self._search_frame_shape = frame_shape
+    
+    def _roi_view(self, height, width, frame_size):
+        """Contiguous (height, width, 3) view into the reusable crop buffer"""
+        if self._roi_buf is None or self._roi_buf.size < frame_size:
+            self._roi_buf = np.empty(frame_size, dtype=np.uint8)
+        return self._roi_buf[:height * width * 3].reshape(height, width, 3)
+    
+    @staticmethod
+    def _hand_bbox(landmarks, width, height):
+        """Padded pixel bounding box of a normalized landmark array, clipped to the frame"""
+        x_min, y_min = landmarks[:, :2].min(axis=0)
+        x_max, y_max = landmarks[:, :2].max(axis=0)
+        x0, x1 = x_min * width, x_max * width
+        y0, y1 = y_min * height, y_max * height
+        pad = max(x1 - x0, y1 - y0) * ROI_MARGIN
+        x0, y0 = max(int(x0 - pad), 0), max(int(y0 - pad), 0)
+        x1, y1 = min(int(x1 + pad) + 1, width), min(int(y1 + pad) + 1, height)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
     
-    def _process_gestures(self, landmarks, image):
+    @staticmethod
+    def _roi_to_frame(landmarks, bbox, width, height):
+        """Rescale a crop-normalized landmark array in place to whole-frame normalized coords"""
+        x0, y0, x1, y1 = bbox
+        crop_w, crop_h = x1 - x0, y1 - y0
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * crop_w) / width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * crop_h) / height
+        landmarks[:, 2] *= crop_w / width
+    
+    @staticmethod
+    def _copy_to_landmarks(landmarks, hand_landmarks):
+        """Write a landmark array back into MediaPipe landmark messages"""
+        for lm, (x, y, z) in zip(hand_landmarks, landmarks.tolist()):
+            lm.x, lm.y, lm.z = x, y, z
+    
+    def _process_gestures(self, landmarks, image, now):
         """Process all gestures and execute active ones"""
         detected_gesture = None
         
-        # Check each gesture
-        for name, gesture in self.gestures.items():
-            if gesture.detect(landmarks):
+        # Extract hand features once, every gesture works on the same values
+        features = HandFeatures.from_array(landmarks)
+        
+        # Only gestures whose finger pattern matches need their full check
+        matches = np.flatnonzero(self._gesture_patterns == features.finger_states)
+        candidates = [self._gesture_names[i] for i in matches] + self._unpatterned_gestures
+        for name in candidates:
+            if self.gestures[name].detect(features):
                 detected_gesture = name
                 break
         
@@ -99,7 +383,7 @@ class AirCommandController:
             
             # Start new gesture
             if detected_gesture:
-                self.gestures[detected_gesture].start_gesture()
+                self.gestures[detected_gesture].start_gesture(now)
                 self.current_gesture = detected_gesture
             else:
                 self.current_gesture = None
@@ -107,45 +391,55 @@ class AirCommandController:
         # Execute current gesture
         if self.current_gesture:
             gesture = self.gestures[self.current_gesture]
-            if gesture.execute():
+            if gesture.execute(now):
                 if not gesture.has_activated:
                     gesture.has_activated = True  # Mark as activated after first execution
                 # Continue executing while gesture is held (cooldown handled in base class)
     
-    def _draw_status(self, image):
+    def _draw_status(self, image, now):
         """Draw status information on the frame"""
         # Draw current gesture status in top left
         if self.current_gesture:
             gesture = self.gestures[self.current_gesture]
-            duration = gesture.get_gesture_duration()
-            
-            # Color based on readiness
-            if gesture.is_ready_to_execute():
-                color = (0, 255, 0)  # Green - ready to execute
-                status = "READY"
-            else:
-                color = (0, 255, 255)  # Yellow - waiting
-                status = "WAITING"
-            
-            cv2.putText(image, f"Active: {gesture.name} ({status})", 
-                      (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                      0.7, color, 2)
-            cv2.putText(image, f"Duration: {duration:.1f}s", 
-                      (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 
-                      0.7, color, 2)
+            key = (gesture.name, gesture.is_ready_to_execute(now))
         else:
-            cv2.putText(image, "No gesture detected", 
-                      (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                      0.7, (100, 100, 100), 2)
+            key = None
+        
+        # Rebuild the status line only when the gesture or its readiness changes
+        if key != self._last_status_key:
+            self._last_status_key = key
+            if key is None:
+                self._status_text, self._status_color = "No gesture detected", STATUS_IDLE_COLOR
+            elif key[1]:
+                self._status_text, self._status_color = f"Active: {key[0]} (READY)", STATUS_READY_COLOR
+            else:
+                self._status_text, self._status_color = f"Active: {key[0]} (WAITING)", STATUS_WAITING_COLOR
+        
+        color = self._status_color
+        cv2.putText(image, self._status_text, STATUS_ORIGIN, STATUS_FONT, STATUS_SCALE, color, STATUS_THICKNESS)
+        if key is not None:
+            duration = gesture.get_gesture_duration(now)
+            cv2.putText(image, f"Duration: {duration:.1f}s", DURATION_ORIGIN,
+                      STATUS_FONT, STATUS_SCALE, color, STATUS_THICKNESS)
     
     def cleanup(self):
         """Clean up resources"""
+        self._stop.set()
+        self._capture_thread.join(timeout=1.0)
+        self._action_thread.join(timeout=1.0)
+        osascript.close()
         self.cap.release()
-        cv2.destroyAllWindows()
+        if self.show_preview:
+            cv2.destroyAllWindows()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AirCommand - Hand Gesture Control")
+    parser.add_argument('--no-draw', action='store_true',
+                        help="run headless, without the preview window")
+    args = parser.parse_args()
+    
     try:
-        controller = AirCommandController()
+        controller = AirCommandController(show_preview=not args.no_draw)
         controller.run()
     except Exception as e:
         print(f"Error: {e}")
@@ -1,6 +1,8 @@
 # AirCommand Gesture Recognition System
 
-from .base_gesture import BaseGesture
+from .base_gesture import BaseGesture, HandFeatures
+from .system_volume import SystemVolume
+from .volume_gesture import VolumeGesture
 from .volume_up_gesture import VolumeUpGesture
 from .volume_down_gesture import VolumeDownGesture
 from .lockscreen_gesture import LockScreenGesture
@@ -0,0 +1,59 @@
+# compiled per-frame hand feature kernel
+# uses numba when it is installed, otherwise the same code runs as plain Python
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # no-op stand-in for numba.njit
+        def decorate(func):
+            return func
+        return decorate
+
+# landmark indices for (thumb, index, middle, ring, pinky)
+FINGER_TIPS = (4, 8, 12, 16, 20)
+FINGER_PIPS = (3, 6, 10, 14, 18) # IP joint for the thumb
+
+
+@njit(cache=True, fastmath=True)
+def extract_features(lms):
+    # compute every per-frame hand feature from a (21, 3) float32 landmark array
+
+    # returns: (state, facing, thumb_direction)
+    #   state: packed finger states, bit set = extended, thumb is bit 0
+    #   facing: hand is upright and inside the frame, see BaseGesture.is_hand_facing_camera
+    #   thumb_direction: 1 = thumb pointing up, -1 = pointing down, 0 = sideways
+
+    # for thumbs up, thumb tip should be clearly above the IP joint
+    state = 1 if lms[4, 1] < lms[3, 1] - 0.02 else 0
+
+    # other fingers are extended when the tip is above the PIP joint (small tolerance)
+    for bit in range(1, 5):
+        if lms[FINGER_TIPS[bit], 1] < lms[FINGER_PIPS[bit], 1] - 0.01:
+            state |= 1 << bit
+
+    # hand center is the average of the index, middle, ring and pinky bases
+    center_x = (lms[5, 0] + lms[9, 0] + lms[13, 0] + lms[17, 0]) / 4
+    center_y = (lms[5, 1] + lms[9, 1] + lms[13, 1] + lms[17, 1]) / 4
+    facing = (abs(lms[0, 0] - center_x) < 0.15
+              and 0.1 < center_y < 0.9
+              and 0.1 < center_x < 0.9)
+
+    # lenient threshold so the thumb does not need to be perfectly straight
+    if lms[4, 1] < lms[3, 1] - 0.01:
+        thumb_direction = 1
+    elif lms[4, 1] > lms[3, 1] + 0.01:
+        thumb_direction = -1
+    else:
+        thumb_direction = 0
+
+    return state, facing, thumb_direction
+
+
+# compile at import (or load from the on-disk cache) instead of on the first hand
+extract_features(np.zeros((21, 3), dtype=np.float32))
@@ -1,12 +1,37 @@
 # base class for all hand gestures
 
+import queue
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from dataclasses import dataclass
+from typing import Optional
 import mediapipe as mp
+import numpy as np
+from ._fast import extract_features
 
 
+@dataclass(frozen=True)
+class HandFeatures:
+    # per-frame hand features, computed once and shared by every gesture
+    finger_states: int # packed bits, see get_finger_states
+    thumb_direction: int # 1 = pointing up, -1 = pointing down, 0 = sideways
+    landmarks: np.ndarray # (21, 3) float32 array from landmarks_to_array
+    
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "HandFeatures":
+        # build features from a (21, 3) float32 landmark array, one compiled kernel call
+        state, _, thumb_direction = extract_features(arr)
+        return cls(
+            finger_states=state,
+            thumb_direction=thumb_direction,
+            landmarks=arr,
+        )
+
 class BaseGesture(ABC):
+    # packed finger states (see get_finger_states) the gesture requires, lets the
+    # controller skip detect() on frames that cannot match, None = always call detect()
+    pattern: Optional[int] = None
+    
     def __init__(self, name: str, cooldown: float = 1.0, activation_delay: float = 0.5):
         self.name = name
         self.cooldown = cooldown
@@ -15,21 +40,37 @@ class BaseGesture(ABC):
         self.is_active = False
         self.activation_time = 0
         self.has_activated = False # track if gesture has been activated
+        self.action_queue = None # set by the controller to run actions off the capture loop
         
-    def can_execute(self) -> bool:
+    # timing methods take an optional `now` (time.monotonic()) so the controller can
+    # read the clock once per frame, they read it themselves when it is omitted
+    
+    def can_execute(self, now: Optional[float] = None) -> bool:
         # check if enough time has passed since last execution
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         return current_time - self.last_execution_time >= self.cooldown
     
-    def mark_executed(self):
+    def mark_executed(self, now: Optional[float] = None):
         # mark the gesture as executed
-        self.last_execution_time = time.time()
+        self.last_execution_time = time.monotonic() if now is None else now
+    
+    def dispatch(self, action, *args) -> bool:
+        # run an action on the controller's worker thread, or inline if there is none
+        # returns False if the worker is backed up and the action was dropped
+        if self.action_queue is None:
+            action(*args)
+            return True
+        try:
+            self.action_queue.put_nowait((action, args))
+            return True
+        except queue.Full:
+            return False
     
-    def start_gesture(self):
+    def start_gesture(self, now: Optional[float] = None):
         # called when gesture is first detected
         if not self.is_active:
             self.is_active = True
-            self.activation_time = time.time()
+            self.activation_time = time.monotonic() if now is None else now
             self.has_activated = False
     
     def end_gesture(self):
@@ -38,126 +79,80 @@ class BaseGesture(ABC):
         self.activation_time = 0
         self.has_activated = False
     
-    def is_ready_to_execute(self) -> bool:
+    def is_ready_to_execute(self, now: Optional[float] = None) -> bool:
         # check if gesture has been held long enough to execute
         if not self.is_active:
             return False
         
-        duration = self.get_gesture_duration()
+        duration = self.get_gesture_duration(now)
         
         # first exec, wait for delay
         if not self.has_activated:
             return duration >= self.activation_delay
         
         # use cooldown
-        return self.can_execute()
+        return self.can_execute(now)
     
-    def get_gesture_duration(self) -> float:
+    def get_gesture_duration(self, now: Optional[float] = None) -> float:
         # get how long the gesture has been active
         if self.is_active:
-            return time.time() - self.activation_time
+            current_time = time.monotonic() if now is None else now
+            return current_time - self.activation_time
         return 0
     
     @abstractmethod
-    def detect(self, landmarks) -> bool:
+    def detect(self, features: HandFeatures) -> bool:
         
         # detect if this gesture is being performed
         
-        # args: landmarks: MediaPipe hand landmarks
+        # args: features: HandFeatures for the current frame
             
         # returns: bool: True if gesture is detected
         
         pass
     
     @abstractmethod
-    def execute(self) -> bool:
+    def execute(self, now: Optional[float] = None) -> bool:
         
         # execute the action associated with this gesture
         
+        # args: now: time.monotonic() timestamp of the current frame
+        
         # returns: bool: True if action was executed successfully
         
         pass
     
-    def get_finger_states(self, landmarks) -> List[int]:
+    @staticmethod
+    def landmarks_to_array(landmarks) -> np.ndarray:
+        # convert MediaPipe hand landmarks to a (21, 3) float32 array of x, y, z
+        # done once per frame so gestures index numbers instead of protobuf attributes
+        return np.asarray([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+    
+    @staticmethod
+    def get_finger_states(landmarks: np.ndarray) -> int:
         
-        # get the state of each finger (1 = extended, 0 = bent)
+        # get the state of each finger packed into one int (bit set = extended)
         
-        # args: landmarks: MediaPipe hand landmarks
+        # args: landmarks: (21, 3) float32 array from landmarks_to_array
             
-         # returns: List[int]: [thumb, index, middle, ring, pinky] states
-        
-        if not landmarks or len(landmarks) < 21:
-            return [0, 0, 0, 0, 0]
-        
-        # get key landmark positions
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        thumb_mcp = landmarks[2] # thumb base
-        
-        index_tip = landmarks[8]
-        index_pip = landmarks[6]
-        index_mcp = landmarks[5]
+        # returns: int: bits 0-4 = thumb, index, middle, ring, pinky
+        #   e.g. 0b00001 = only thumb extended, 0b11111 = open palm
         
-        middle_tip = landmarks[12]
-        middle_pip = landmarks[10]
-        middle_mcp = landmarks[9]
+        if landmarks is None or len(landmarks) < 21:
+            return 0
         
-        ring_tip = landmarks[16]
-        ring_pip = landmarks[14]
-        ring_mcp = landmarks[13]
-        
-        pinky_tip = landmarks[20]
-        pinky_pip = landmarks[18]
-        pinky_mcp = landmarks[17]
-        
-        fingers = []
-        
-        # check if the thumb tip is extended beyond the IP joint
-        # for thumbs up, tip should be above IP joint
-        thumb_extended = thumb_tip.y < thumb_ip.y - 0.02
-        fingers.append(1 if thumb_extended else 0)
-        
-        # other fingers, check if tip is above the PIP joint
-        # for closed fingers, tip should be below or close to PIP joint
-        for tip, pip in [(index_tip, index_pip), (middle_tip, middle_pip), 
-                        (ring_tip, ring_pip), (pinky_tip, pinky_pip)]:
-            finger_extended = tip.y < pip.y - 0.01  # Small tolerance
-            fingers.append(1 if finger_extended else 0)
-        
-        return fingers
+        # kept for callers outside the controller, HandFeatures already has this
+        return extract_features(landmarks)[0]
     
-    def is_hand_facing_camera(self, landmarks) -> bool:
+    def is_hand_facing_camera(self, landmarks: np.ndarray) -> bool:
         # Check if the hand is in a reasonable position for gesture detection More lenient detection that works with natural hand positions
         
-        # Args: landmarks: MediaPipe hand landmarks
+        # Args: landmarks: (21, 3) float32 array from landmarks_to_array
             
         # Returns: bool: True if hand is in good position for gesture detection
         
-        if not landmarks or len(landmarks) < 21:
+        if landmarks is None or len(landmarks) < 21:
             return False
         
-        # get key points for orientation detection
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9] # middle finger base
-        index_mcp = landmarks[5] # index finger base
-        ring_mcp = landmarks[13] # ring finger base
-        pinky_mcp = landmarks[17] # pinky base
-        
-        # calculate hand center (average of finger bases)
-        hand_center_x = (index_mcp.x + middle_mcp.x + ring_mcp.x + pinky_mcp.x) / 4
-        hand_center_y = (index_mcp.y + middle_mcp.y + ring_mcp.y + pinky_mcp.y) / 4
-        
-        # more lenient check, hand should be roughly upright and not too tilted
-        # check if wrist is reasonably positioned relative to hand center
-        wrist_hand_distance = abs(wrist.y - hand_center_y)
-        
-        # check if hand is not too tilted (wrist and hand center should be roughly aligned horizontally)
-        horizontal_alignment = abs(wrist.x - hand_center_x) < 0.15
-        
-        # check if hand is in a reasonable vertical position (not too high or low)
-        reasonable_position = 0.1 < hand_center_y < 0.9
-        
-        # check if hand is not too far to the sides
-        reasonable_horizontal = 0.1 < hand_center_x < 0.9
-        
-        return horizontal_alignment and reasonable_position and reasonable_horizontal
+        # wrist roughly below the hand center and the hand not near the frame edges
+        return bool(extract_features(landmarks)[1])
@@ -3,12 +3,17 @@
 import subprocess
 import time
 from typing import Optional
-from .base_gesture import BaseGesture
+from .base_gesture import BaseGesture, HandFeatures
+
+# open palm: 0b11111 (all fingers extended)
+_OPEN_PALM = 0b11111
 
 
 class LockScreenGesture(BaseGesture):
     # open palm gesture that locks the laptop screen
     
+    pattern = _OPEN_PALM
+    
     def __init__(self):
         super().__init__(
             name="lockscreen",
@@ -16,33 +21,25 @@ class LockScreenGesture(BaseGesture):
             activation_delay=1.0 # 1 second delay before first execution
         )
     
-    def detect(self, landmarks) -> bool:
+    def detect(self, features: HandFeatures) -> bool:
         # detect open palm gesture ✋
         # Open palm: All fingers extended (including thumb)
-        if not landmarks:
+        if features is None:
             return False
-            
-        finger_states = self.get_finger_states(landmarks)
         
-        # open palm: [1, 1, 1, 1, 1] (all fingers extended)
-        return finger_states == [1, 1, 1, 1, 1]
+        return features.finger_states == self.pattern
     
-    def execute(self) -> bool:  
+    def execute(self, now: Optional[float] = None) -> bool:  
         # execute lockscreen command
-        if not self.is_ready_to_execute():
+        if not self.is_ready_to_execute(now):
             return False
             
-        try:
-            # execute lockscreen command
-            self.lock_screen()
-            
-            self.mark_executed()
-            print("Screen locked")
-            return True
-            
-        except Exception as e:
-            print(f"Failed to execute lockscreen: {e}")
+        # osascript is slow, run it on the action worker
+        if not self.dispatch(self.lock_screen):
             return False
+        
+        self.mark_executed(now)
+        return True
     
     def lock_screen(self):   
         # lock the laptop screen using AppleScript
@@ -56,6 +53,7 @@ class LockScreenGesture(BaseGesture):
         try:
             subprocess.run(['osascript', '-e', script], 
                          check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
+            print("Screen locked")
+        except (subprocess.CalledProcessError, OSError) as e:
             print(f"Failed to lock screen: {e}")
              
\ No newline at end of file
@@ -0,0 +1,107 @@
+# persistent osascript session shared by all gestures
+
+import os
+import select
+import subprocess
+import threading
+import time
+from typing import Optional
+
+# printed after every statement so we know where its output ends
+_SENTINEL = "AIRCOMMAND_DONE"
+
+# longest wait for a statement's output before the session is considered stuck
+# (e.g. osascript buffering its output or waiting on a permission prompt)
+TIMEOUT = 2.0
+
+_lock = threading.Lock()
+_osa: Optional[subprocess.Popen] = None
+_interactive = True # False once the -i session timed out, every call then uses osascript -e
+
+
+def _session() -> subprocess.Popen:
+    # start osascript in interactive mode once, every later statement reuses it
+    # so each call costs a pipe write instead of a fork/exec
+    global _osa
+    if _osa is None or _osa.poll() is not None:
+        _osa = subprocess.Popen(
+            ['osascript', '-i'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+    return _osa
+
+
+def _read_until_sentinel(osa: subprocess.Popen) -> str:
+    # read raw stdout with select() so a silent osascript cannot block us past TIMEOUT
+    fd = osa.stdout.fileno()
+    sentinel = _SENTINEL.encode()
+    deadline = time.monotonic() + TIMEOUT
+    data = b""
+    while sentinel not in data:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"osascript did not answer within {TIMEOUT}s")
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            raise OSError("osascript session ended")
+        data += chunk
+    
+    # keep the lines before the one that echoes the sentinel
+    output = data[:data.index(sentinel)]
+    return output[:output.rfind(b"\n") + 1].decode(errors="replace")
+
+
+def _run_once(statement: str) -> str:
+    # run a statement in its own osascript process, the pre-session behaviour
+    try:
+        result = subprocess.run(['osascript', '-e', statement], capture_output=True,
+                                text=True, check=True, timeout=TIMEOUT)
+    except subprocess.SubprocessError as e:
+        raise OSError(f"osascript failed: {e}") from e
+    return result.stdout
+
+
+def run(statement: str) -> str:
+    # run a single-line AppleScript statement and return whatever it printed
+    # raises OSError if osascript cannot be started or the statement failed
+    global _osa, _interactive
+    with _lock:
+        if not _interactive:
+            return _run_once(statement)
+        
+        osa = _session()
+        try:
+            osa.stdin.write(f'{statement}\n"{_SENTINEL}"\n'.encode())
+            return _read_until_sentinel(osa)
+        except TimeoutError:
+            # the session does not answer (e.g. block-buffered stdout on a pipe), stop
+            # using it instead of respawning it on every call
+            osa.kill()
+            _osa = None
+            _interactive = False
+            print("osascript -i did not respond, falling back to one process per command")
+            return _run_once(statement)
+        except OSError:
+            # drop the broken session, the next call starts a new one
+            osa.kill()
+            _osa = None
+            raise
+
+
+def close():
+    # stop the session if one is running
+    global _osa
+    with _lock:
+        if _osa is not None and _osa.poll() is None:
+            try:
+                _osa.stdin.close()
+            except OSError:
+                pass
+            _osa.terminate()
+        _osa = None
@@ -0,0 +1,36 @@
+# system output volume tracked in-process
+
+import re
+from typing import Optional
+from . import osascript
+
+
+class SystemVolume:
+    # output volume queried from macOS once, then updated locally on every set
+    # so volume steps cost one osascript statement instead of two
+    
+    def __init__(self):
+        self.level: Optional[int] = None # last known volume percentage
+    
+    def get(self) -> Optional[int]:
+        # get current system volume percentage, only asks osascript if unknown
+        if self.level is None:
+            self.level = self._query()
+        return self.level
+    
+    def set(self, volume: int):
+        # set system volume and remember it
+        try:
+            osascript.run(f'set volume output volume {volume}')
+        except OSError:
+            # the statement may still have been applied, re-query on the next step
+            self.level = None
+            raise
+        self.level = volume
+    
+    def _query(self) -> Optional[int]:
+        try:
+            result = osascript.run('output volume of (get volume settings)')
+            return int(re.search(r'\d+', result).group())
+        except (OSError, AttributeError, ValueError):
+            return None
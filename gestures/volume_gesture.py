@@ -0,0 +1,55 @@
+# base class for gestures that step the system volume
+
+from abc import abstractmethod
+from typing import Optional
+from .base_gesture import BaseGesture
+from .system_volume import SystemVolume
+
+
+class VolumeGesture(BaseGesture):
+    # changes the system volume by volume_step every time the gesture executes
+    
+    label = "Volume" # used in log messages, e.g. "Volume up"
+    
+    def __init__(self, name: str, cooldown: float = 0.6, activation_delay: float = 0.2):
+        super().__init__(name=name, cooldown=cooldown, activation_delay=activation_delay)
+        self.volume_step = 5 # volume change per gesture
+        self.system_volume: Optional[SystemVolume] = None # shared volume cache, set by the controller
+    
+    @abstractmethod
+    def target_volume(self, current_volume: int) -> int:
+        # volume to set after one step from current_volume
+        pass
+    
+    def execute(self, now: Optional[float] = None) -> bool:
+        # execute volume command with macOS-style overlay
+        if not self.is_ready_to_execute(now):
+            return False
+        
+        # osascript calls are slow, run them on the action worker
+        if not self.dispatch(self._step_volume):
+            return False
+        
+        self.mark_executed(now)
+        return True
+    
+    def _step_volume(self):
+        # change the system volume by one step
+        if self.system_volume is None:
+            print(f"Failed to execute {self.label.lower()}: no system volume attached")
+            return
+        
+        try:
+            # get current volume (cached after the first query)
+            current_volume = self.system_volume.get()
+            if current_volume is None:
+                return
+            
+            # calculate and set new volume
+            new_volume = self.target_volume(current_volume)
+            self.system_volume.set(new_volume)
+            
+            print(f"{self.label}: {current_volume}% → {new_volume}%")
+            
+        except Exception as e:
+            print(f"Failed to execute {self.label.lower()}: {e}")